@@ -2,72 +2,235 @@
 API request/response interceptor and validator.
 """
 from playwright.sync_api import Page, Route, Request, Response
-from typing import List, Dict, Any, Optional
+from playwright.async_api import Page as AsyncPage, Route as AsyncRoute
+from typing import List, Dict, Any, Optional, Iterator, Set, Pattern, Deque, Union
 from utils.logger import test_logger
+from collections import defaultdict, deque
+from datetime import datetime
+from urllib.parse import parse_qs, unquote_plus
 import json
+import re
+import sys
+import time
+import weakref
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
-class APIInterceptor:
-    """Intercept and validate API requests/responses."""
+
+_URL_TOKEN_SEPARATORS = re.compile(r"[/?&=]")
+
+# Default interception target; page.route() matches a compiled pattern
+# directly instead of translating a glob on every setup
+_TMDB_PATTERN = re.compile(r"^https?://api\.themoviedb\.org/")
+
+# Shared instances for HTTP methods stored on every captured request
+_METHOD_INTERN = {m: sys.intern(m) for m in ("GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS")}
+
+# Captured entries store monotonic nanoseconds; these anchors map them back
+# to wall-clock time when a caller asks for a readable timestamp.
+_ts = time.monotonic_ns
+_WALL_ANCHOR_NS = time.time_ns()
+_MONO_ANCHOR_NS = _ts()
+
+
+def iso_timestamp(ns: int) -> str:
+    """
+    Convert a captured entry timestamp to an ISO 8601 string.
+    
+    Args:
+        ns: Monotonic nanoseconds as stored in a captured entry
+        
+    Returns:
+        Local wall-clock time in ISO 8601 format
+    """
+    return datetime.fromtimestamp((_WALL_ANCHOR_NS + ns - _MONO_ANCHOR_NS) / 1e9).isoformat()
+
+
+def _tokenize_url(url: str) -> Set[str]:
+    """Split a URL into the path/query tokens used by the capture index."""
+    return {token for token in _URL_TOKEN_SEPARATORS.split(url) if token}
+
+
+class _CaptureIndex:
+    """
+    URL token index over a bounded capture log.
+    
+    Entries are numbered by absolute capture sequence, so positions stay
+    valid when the log's deque evicts its oldest entries.
+    """
     
     def __init__(self):
-        self.logger = test_logger
-        self.requests: List[Dict[str, Any]] = []
-        self.responses: List[Dict[str, Any]] = []
+        self._buckets: Dict[str, List[int]] = defaultdict(list)
+        self._next_seq = 0
     
-    def setup_interception(self, page: Page, url_pattern: str = "**/api.themoviedb.org/**") -> None:
+    def append(self, entries: Deque[Dict[str, Any]], entry: Dict[str, Any]) -> None:
+        """Append an entry to the log and index it under its URL tokens."""
+        if entries.maxlen is not None and len(entries) == entries.maxlen:
+            # The deque is about to drop its oldest entry, which is always
+            # the head of each of its buckets
+            for token in _tokenize_url(entries[0]["url"]):
+                bucket = self._buckets[token]
+                bucket.pop(0)
+                if not bucket:
+                    del self._buckets[token]
+        entries.append(entry)
+        for token in _tokenize_url(entry["url"]):
+            self._buckets[token].append(self._next_seq)
+        self._next_seq += 1
+    
+    def last_matching(self, entries: Deque[Dict[str, Any]], url_substring: str) -> Optional[Dict[str, Any]]:
         """
-        Setup API interception for specific URL pattern.
+        Find the most recent entry whose URL contains a substring.
         
+        When the substring is a whole URL token, the index gives the last
+        entry known to match, so only the entries captured after it need
+        a substring check.
+        """
+        bucket = self._buckets.get(url_substring)
+        first_seq = self._next_seq - len(entries)
+        stop = bucket[-1] - first_seq if bucket else -1
+        for position in range(len(entries) - 1, stop, -1):
+            if url_substring in entries[position]["url"]:
+                return entries[position]
+        return entries[stop] if bucket else None
+    
+    def clear(self) -> None:
+        """Drop all indexed positions."""
+        self._buckets.clear()
+
+
+class BaseAPIInterceptor:
+    """
+    Capture storage, lookups and validators shared by the sync and async
+    interceptors; subclasses install the route handler.
+    """
+    
+    def __init__(self, max_history: int = 256):
+        """
         Args:
-            page: Playwright page object
-            url_pattern: URL pattern to intercept
+            max_history: Maximum number of requests/responses kept; older
+                entries are dropped first
+                
+        Raises:
+            ValueError: If max_history is less than 1
+        """
+        if max_history < 1:
+            raise ValueError(f"max_history must be at least 1, got {max_history}")
+        self.logger = test_logger
+        self.requests: Deque[Dict[str, Any]] = deque(maxlen=max_history)
+        self.responses: Deque[Dict[str, Any]] = deque(maxlen=max_history)
+        self._req_index = _CaptureIndex()
+        self._resp_index = _CaptureIndex()
+        # page -> {URL pattern -> capture options of the route installed for it}
+        self._routed_pages: "weakref.WeakKeyDictionary[Any, Dict[Any, Dict[str, bool]]]" = weakref.WeakKeyDictionary()
+    
+    def _register_route(self, page: Any, url_pattern: Union[str, Pattern[str]],
+                        capture_responses: bool, capture_headers: bool) -> Optional[Dict[str, bool]]:
+        """
+        Record capture options for a page/pattern route.
+        
+        Options belong to one page and pattern, so setting up another page
+        never changes what routes already installed elsewhere capture. A
+        repeated call for the same page and pattern updates that route's
+        options in place.
+        
+        Returns:
+            Options dict to bind into a new route handler, or None if the
+            pattern is already routed on this page
         """
-        self.logger.info(f"Setting up API interception for: {url_pattern}")
+        pattern_text = getattr(url_pattern, "pattern", url_pattern)
+        routes = self._routed_pages.setdefault(page, {})
+        options = {"capture_responses": capture_responses, "capture_headers": capture_headers}
+        if url_pattern in routes:
+            routes[url_pattern].update(options)
+            self.logger.debug("API interception already set up for: %s", pattern_text)
+            return None
         
-        page.route(url_pattern, self._handle_route)
+        self.logger.info("Setting up API interception for: %s", pattern_text)
+        routes[url_pattern] = options
+        return options
+    
+    @staticmethod
+    def _fulfill_args(response: Any, body: Optional[bytes]) -> Dict[str, Any]:
+        """Build route.fulfill() arguments, reusing the fetched body when available."""
+        if body is None:
+            return {"response": response}
+        return {"status": response.status, "headers": response.headers, "body": body}
     
-    def _handle_route(self, route: Route) -> None:
+    def _capture_request(self, request: Any, capture_headers: bool) -> None:
         """
-        Handle intercepted route.
+        Record an intercepted request.
         
         Args:
-            route: Playwright route object
+            request: Playwright request object (sync or async API)
+            capture_headers: Store request headers on the entry
         """
-        request = route.request
-        
-        # Capture request details
+        url = request.url
+        method = request.method
         request_data = {
-            "url": request.url,
-            "method": request.method,
-            "headers": request.headers,
+            "url": url,
+            "parsed_qs": None,
+            "method": _METHOD_INTERN.get(method, method),
+            "headers": tuple(request.headers.items()) if capture_headers else None,
             "post_data": request.post_data,
-            "timestamp": self._get_timestamp()
+            "timestamp": _ts()
         }
-        self.requests.append(request_data)
-        self.logger.debug(f"Captured request: {request.method} {request.url}")
+        self._req_index.append(self.requests, request_data)
+        self.logger.debug("Captured request: %s %s", method, url)
+    
+    def _capture_response(self, request: Any, response: Any, body: bytes, capture_headers: bool) -> None:
+        """
+        Record the response fetched for an intercepted request.
         
-        # Continue request and capture response
-        response = route.fetch()
+        Args:
+            request: Playwright request object (sync or async API)
+            response: Playwright API response returned by route.fetch()
+            body: Raw response body
+            capture_headers: Store response headers on the entry
+        """
+        response_data = {
+            "url": request.url,
+            "status": response.status,
+            "status_text": response.status_text,
+            "headers": tuple(response.headers.items()) if capture_headers else None,
+            "body": body,
+            "parsed": None,
+            "timestamp": _ts()
+        }
+        self._resp_index.append(self.responses, response_data)
+        self.logger.debug("Captured response: %s %s", response.status, request.url)
+    
+    def iter_requests(self, filter_url: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over captured requests, optionally filtered by URL.
         
-        # Capture response details
-        try:
-            body = response.text()
-            response_data = {
-                "url": request.url,
-                "status": response.status,
-                "status_text": response.status_text,
-                "headers": response.headers,
-                "body": body,
-                "timestamp": self._get_timestamp()
-            }
-            self.responses.append(response_data)
-            self.logger.debug(f"Captured response: {response.status} {request.url}")
-        except Exception as e:
-            self.logger.error(f"Error capturing response: {str(e)}")
+        Args:
+            filter_url: Optional URL substring to filter by
+            
+        Returns:
+            Iterator of request dictionaries, oldest first
+        """
+        if filter_url:
+            return (req for req in self.requests if filter_url in req["url"])
+        return iter(self.requests)
+    
+    def iter_responses(self, filter_url: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over captured responses, optionally filtered by URL.
         
-        # Fulfill the route with original response
-        route.fulfill(response=response)
+        Args:
+            filter_url: Optional URL substring to filter by
+            
+        Returns:
+            Iterator of response dictionaries, oldest first
+        """
+        if filter_url:
+            return (resp for resp in self.responses if filter_url in resp["url"])
+        return iter(self.responses)
     
     def get_requests(self, filter_url: Optional[str] = None) -> List[Dict[str, Any]]:
         """
@@ -79,9 +242,7 @@ class APIInterceptor:
         Returns:
             List of request dictionaries
         """
-        if filter_url:
-            return [req for req in self.requests if filter_url in req["url"]]
-        return self.requests
+        return list(self.iter_requests(filter_url))
     
     def get_responses(self, filter_url: Optional[str] = None) -> List[Dict[str, Any]]:
         """
@@ -93,9 +254,7 @@ class APIInterceptor:
         Returns:
             List of response dictionaries
         """
-        if filter_url:
-            return [resp for resp in self.responses if filter_url in resp["url"]]
-        return self.responses
+        return list(self.iter_responses(filter_url))
     
     def get_last_request(self) -> Optional[Dict[str, Any]]:
         """Get the most recent request."""
@@ -105,32 +264,62 @@ class APIInterceptor:
         """Get the most recent response."""
         return self.responses[-1] if self.responses else None
     
+    def get_last_request_for(self, url_substring: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the most recent request whose URL contains a substring.
+        
+        Args:
+            url_substring: Substring to identify the request
+            
+        Returns:
+            Request dictionary, or None if nothing matches
+        """
+        return self._req_index.last_matching(self.requests, url_substring)
+    
+    def get_last_response_for(self, url_substring: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the most recent response whose URL contains a substring.
+        
+        Args:
+            url_substring: Substring to identify the response
+            
+        Returns:
+            Response dictionary, or None if nothing matches
+        """
+        return self._resp_index.last_matching(self.responses, url_substring)
+    
     def validate_request_contains(self, url_substring: str, expected_params: Dict[str, Any]) -> bool:
         """
         Validate that a request contains expected parameters.
         
         Args:
             url_substring: Substring to identify the request
-            expected_params: Expected parameters in URL
+            expected_params: Expected parameters in URL; values must match
+                exactly and may be given raw or percent-encoded
             
         Returns:
             True if validation passes, False otherwise
         """
-        matching_requests = self.get_requests(filter_url=url_substring)
+        last_request = self.get_last_request_for(url_substring)
         
-        if not matching_requests:
-            self.logger.error(f"No requests found matching: {url_substring}")
+        if last_request is None:
+            self.logger.error("No requests found matching: %s", url_substring)
             return False
         
-        last_request = matching_requests[-1]
-        url = last_request["url"]
+        if last_request["parsed_qs"] is None:
+            last_request["parsed_qs"] = parse_qs(last_request["url"].partition("?")[2], keep_blank_values=True)
+        query_params = last_request["parsed_qs"]
         
         for param, value in expected_params.items():
-            if f"{param}={value}" not in url:
-                self.logger.error(f"Expected parameter not found: {param}={value}")
+            # parse_qs decodes the URL; accept the expected value as given
+            # or decoded, so both raw ("C++") and encoded ("C%2B%2B") match
+            actual_values = query_params.get(param, ())
+            expected = str(value)
+            if expected not in actual_values and unquote_plus(expected) not in actual_values:
+                self.logger.error("Expected parameter not found: %s=%s", param, value)
                 return False
         
-        self.logger.info(f"Request validation passed for: {url_substring}")
+        self.logger.info("Request validation passed for: %s", url_substring)
         return True
     
     def validate_response_status(self, url_substring: str, expected_status: int) -> bool:
@@ -144,20 +333,19 @@ class APIInterceptor:
         Returns:
             True if validation passes, False otherwise
         """
-        matching_responses = self.get_responses(filter_url=url_substring)
+        last_response = self.get_last_response_for(url_substring)
         
-        if not matching_responses:
-            self.logger.error(f"No responses found matching: {url_substring}")
+        if last_response is None:
+            self.logger.error("No responses found matching: %s", url_substring)
             return False
         
-        last_response = matching_responses[-1]
         actual_status = last_response["status"]
         
         if actual_status != expected_status:
-            self.logger.error(f"Status mismatch. Expected: {expected_status}, Actual: {actual_status}")
+            self.logger.error("Status mismatch. Expected: %s, Actual: %s", expected_status, actual_status)
             return False
         
-        self.logger.info(f"Response status validation passed: {expected_status}")
+        self.logger.info("Response status validation passed: %s", expected_status)
         return True
     
     def validate_response_json_schema(self, url_substring: str, expected_keys: List[str]) -> bool:
@@ -171,37 +359,129 @@ class APIInterceptor:
         Returns:
             True if validation passes, False otherwise
         """
-        matching_responses = self.get_responses(filter_url=url_substring)
+        last_response = self.get_last_response_for(url_substring)
         
-        if not matching_responses:
-            self.logger.error(f"No responses found matching: {url_substring}")
+        if last_response is None:
+            self.logger.error("No responses found matching: %s", url_substring)
             return False
         
-        last_response = matching_responses[-1]
+        if last_response["parsed"] is None:
+            try:
+                last_response["parsed"] = _json_loads(last_response["body"])
+            except ValueError as e:
+                self.logger.error("Invalid JSON response: %s", e)
+                return False
+        response_json = last_response["parsed"]
         
-        try:
-            response_json = json.loads(last_response["body"])
-            
+        if not isinstance(response_json, dict):
+            self.logger.error("Response JSON is not an object")
+            return False
+        
+        missing = set(expected_keys).difference(response_json)
+        if missing:
             for key in expected_keys:
-                if key not in response_json:
-                    self.logger.error(f"Expected key not found in response: {key}")
-                    return False
-            
-            self.logger.info("Response JSON schema validation passed")
-            return True
-            
-        except json.JSONDecodeError as e:
-            self.logger.error(f"Invalid JSON response: {str(e)}")
+                if key in missing:
+                    self.logger.error("Expected key not found in response: %s", key)
             return False
+        
+        self.logger.info("Response JSON schema validation passed")
+        return True
     
     def clear_history(self) -> None:
         """Clear all captured requests and responses."""
         self.requests.clear()
         self.responses.clear()
+        self._req_index.clear()
+        self._resp_index.clear()
         self.logger.info("API interception history cleared")
+
+
+class APIInterceptor(BaseAPIInterceptor):
+    """Intercept and validate API requests/responses."""
     
-    @staticmethod
-    def _get_timestamp() -> str:
-        """Get current timestamp."""
-        from datetime import datetime
-        return datetime.now().isoformat()
+    def setup_interception(self, page: Page, url_pattern: Union[str, Pattern[str]] = _TMDB_PATTERN,
+                           capture_responses: bool = False, capture_headers: bool = False) -> None:
+        """
+        Setup API interception for specific URL pattern.
+        
+        Each pattern is routed once per page, so a shared interceptor can be
+        set up again from every test without re-registering handlers. The
+        capture options apply to this page and pattern only.
+        
+        Args:
+            page: Playwright page object
+            url_pattern: Compiled URL regex to intercept; glob strings
+                such as "**/api.themoviedb.org/**" are still accepted
+            capture_responses: Fetch and record responses so the
+                validate_response_* methods can be used; when False,
+                requests are recorded and continued untouched
+            capture_headers: Record request/response headers as tuples of
+                (name, value) pairs; when False, "headers" is None
+        """
+        options = self._register_route(page, url_pattern, capture_responses, capture_headers)
+        if options is not None:
+            page.route(url_pattern, lambda route: self._handle_route(route, options))
+    
+    def _handle_route(self, route: Route, options: Dict[str, bool]) -> None:
+        """
+        Handle intercepted route.
+        
+        Args:
+            route: Playwright route object
+            options: Capture options of the route's page and pattern
+        """
+        request = route.request
+        self._capture_request(request, options["capture_headers"])
+        
+        if not options["capture_responses"]:
+            route.continue_()
+            return
+        
+        # Continue request and capture response
+        response = route.fetch()
+        
+        # Capture response details, keeping the raw body bytes
+        body: Optional[bytes] = None
+        try:
+            body = response.body()
+            self._capture_response(request, response, body, options["capture_headers"])
+        except Exception as e:
+            self.logger.error("Error capturing response: %s", e)
+        
+        # Fulfill the route with the already fetched body
+        route.fulfill(**self._fulfill_args(response, body))
+
+
+class AsyncAPIInterceptor(BaseAPIInterceptor):
+    """
+    Intercept and validate API requests/responses with playwright.async_api.
+    
+    The route handler awaits the upstream fetch, so several intercepted
+    requests can be in flight at once instead of queueing behind each other.
+    """
+    
+    async def setup_interception(self, page: AsyncPage, url_pattern: Union[str, Pattern[str]] = _TMDB_PATTERN,
+                                 capture_responses: bool = False, capture_headers: bool = False) -> None:
+        """Async counterpart of APIInterceptor.setup_interception."""
+        options = self._register_route(page, url_pattern, capture_responses, capture_headers)
+        if options is not None:
+            await page.route(url_pattern, lambda route: self._handle_route(route, options))
+    
+    async def _handle_route(self, route: AsyncRoute, options: Dict[str, bool]) -> None:
+        """Async counterpart of APIInterceptor._handle_route."""
+        request = route.request
+        self._capture_request(request, options["capture_headers"])
+        
+        if not options["capture_responses"]:
+            await route.continue_()
+            return
+        
+        response = await route.fetch()
+        body: Optional[bytes] = None
+        try:
+            body = await response.body()
+            self._capture_response(request, response, body, options["capture_headers"])
+        except Exception as e:
+            self.logger.error("Error capturing response: %s", e)
+        
+        await route.fulfill(**self._fulfill_args(response, body))
@@ -2,7 +2,7 @@
 Base Page Object Model - Parent class for all page objects.
 """
 from playwright.sync_api import Page, Locator, expect
-from typing import Optional
+from typing import Dict, Optional
 #... other required imports
 import logging
 
@@ -11,7 +11,25 @@ class BasePage:
     
     def __init__(self, page: Page):
         self.page = page
-        self.logger = logging #this need to be fine tuned
+        self.logger = logging.getLogger(__name__)
+        self._locator_cache: Dict[str, Locator] = {}
+        self._base_url = config.base_url
+        self._default_url = f"{self._base_url}/"
+    
+    def loc(self, selector: str) -> Locator:
+        """
+        Get a locator for a selector, reusing one built earlier on this page.
+        
+        Args:
+            selector: Selector string
+            
+        Returns:
+            Playwright locator object
+        """
+        locator = self._locator_cache.get(selector)
+        if locator is None:
+            locator = self._locator_cache[selector] = self.page.locator(selector)
+        return locator
     
     def navigate(self, path: str = "/") -> None:
         """
@@ -20,16 +38,28 @@ class BasePage:
         Args:
             path: URL path to navigate to (default: "/")
         """
-        url = f"{config.base_url}{path}"
-        self.logger.info(f"Navigating to: {url}")
+        url = self._default_url if path == "/" else f"{self._base_url}{path}"
+        self.logger.info("Navigating to: %s", url)
+        self._locator_cache.clear()
         self.page.goto(url, timeout=config.navigation_timeout)
         self.wait_for_page_load()
+        self.wait_for_ready()
     
     def wait_for_page_load(self) -> None:
-        """Wait for page to fully load."""
-        self.page.wait_for_load_state("networkidle", timeout=config.navigation_timeout)
+        """Wait for the DOM to be loaded."""
+        self.page.wait_for_load_state("domcontentloaded", timeout=config.navigation_timeout)
         self.logger.debug("Page loaded successfully")
     
+    def wait_for_ready(self) -> None:
+        """
+        Wait for page-specific content to be ready.
+        
+        Defaults to waiting for the network to go idle. Subclasses override
+        this with a wait on a locator that signals the page is usable (e.g.
+        the results container), which avoids the networkidle settle time.
+        """
+        self.page.wait_for_load_state("networkidle", timeout=config.navigation_timeout)
+    
     def click_element(self, locator: Locator, description: str = "") -> None:
         """
         Click an element with logging.
@@ -38,7 +68,7 @@ class BasePage:
             locator: Playwright locator object
             description: Description of element being clicked
         """
-        self.logger.info(f"Clicking element: {description or locator}")
+        self.logger.info("Clicking element: %s", description or locator)
         locator.click(timeout=config.action_timeout)
     
     def fill_input(self, locator: Locator, text: str, description: str = "") -> None:
@@ -50,7 +80,7 @@ class BasePage:
             text: Text to fill
             description: Description of input field
         """
-        self.logger.info(f"Filling input '{description}' with: {text}")
+        self.logger.info("Filling input '%s' with: %s", description, text)
         locator.fill(text, timeout=config.action_timeout)
     
     def get_text(self, locator: Locator) -> str:
@@ -64,7 +94,7 @@ class BasePage:
             Text content of the element
         """
         text = locator.text_content(timeout=config.action_timeout)
-        self.logger.debug(f"Retrieved text: {text}")
+        self.logger.debug("Retrieved text: %s", text)
         return text or ""
     
     def get_element_count(self, locator: Locator) -> int:
@@ -78,7 +108,7 @@ class BasePage:
             Number of matching elements
         """
         count = locator.count()
-        self.logger.debug(f"Element count: {count}")
+        self.logger.debug("Element count: %s", count)
         return count
     
     def is_visible(self, locator: Locator, timeout: Optional[int] = None) -> bool:
@@ -122,7 +152,7 @@ class BasePage:
         """
         screenshot_path = config.screenshots_dir / f"{name}.png"
         self.page.screenshot(path=str(screenshot_path))
-        self.logger.info(f"Screenshot saved: {screenshot_path}")
+        self.logger.info("Screenshot saved: %s", screenshot_path)
         return str(screenshot_path)
     
     def wait_for_element(self, locator: Locator, state: str = "visible", timeout: Optional[int] = None) -> None:
@@ -134,7 +164,7 @@ class BasePage:
             state: State to wait for (visible, hidden, attached, detached)
             timeout: Custom timeout in milliseconds
         """
-        self.logger.debug(f"Waiting for element to be {state}")
+        self.logger.debug("Waiting for element to be %s", state)
         locator.wait_for(state=state, timeout=timeout or config.action_timeout)
     
     def get_current_url(self) -> str:
@@ -144,4 +174,5 @@ class BasePage:
     def reload_page(self) -> None:
         """Reload the current page."""
         self.logger.info("Reloading page")
+        self._locator_cache.clear()
         self.page.reload()
@@ -0,0 +1,25 @@
+"""
+Shared fixtures for page-level tests.
+"""
+import pytest
+from pages.api_interceptor import APIInterceptor
+
+
+@pytest.fixture(scope="session")
+def api_interceptor() -> APIInterceptor:
+    """
+    Session-wide API interceptor.
+
+    Route handlers are installed once per page and URL pattern, and the
+    captured history is cleared before every test that uses this fixture.
+    """
+    return APIInterceptor()
+
+
+@pytest.fixture(autouse=True)
+def _clear_api_history(request: pytest.FixtureRequest):
+    """Reset the shared interceptor's history before each test that uses it."""
+    if "api_interceptor" in request.fixturenames:
+        request.getfixturevalue("api_interceptor").clear_history()
+    yield
+
@@ -0,0 +1,285 @@
+"""
+Unit tests for APIInterceptor capture and validation, driven by fake routes.
+"""
+import asyncio
+import pytest
+from pages.api_interceptor import APIInterceptor, AsyncAPIInterceptor, BaseAPIInterceptor
+
+
+DISCOVER_URL = "https://api.themoviedb.org/3/discover/movie?year={year}&sort_by=popularity.desc"
+RESPONSE_BODY = b'{"page": 1, "results": [], "total_pages": 1, "total_results": 0}'
+
+
+class FakeRequest:
+    """Minimal stand-in for a Playwright request."""
+
+    def __init__(self, url: str, method: str = "GET"):
+        self.url = url
+        self.method = method
+        self.headers = {"accept": "application/json"}
+        self.post_data = None
+
+
+class FakeResponse:
+    """Minimal stand-in for the APIResponse returned by route.fetch()."""
+
+    status = 200
+    status_text = "OK"
+    headers = {"content-type": "application/json"}
+
+    def body(self) -> bytes:
+        return RESPONSE_BODY
+
+
+class FakeRoute:
+    """Fake sync route recording how it was resolved."""
+
+    def __init__(self, url: str):
+        self.request = FakeRequest(url)
+        self.calls = []
+
+    def fetch(self) -> FakeResponse:
+        return FakeResponse()
+
+    def fulfill(self, **kwargs) -> None:
+        self.calls.append(("fulfill", kwargs))
+
+    def continue_(self) -> None:
+        self.calls.append(("continue", {}))
+
+
+class FakeAsyncResponse(FakeResponse):
+    """Async variant of FakeResponse."""
+
+    async def body(self) -> bytes:
+        return RESPONSE_BODY
+
+
+class FakeAsyncRoute(FakeRoute):
+    """Fake async route recording how it was resolved."""
+
+    async def fetch(self) -> FakeAsyncResponse:
+        return FakeAsyncResponse()
+
+    async def fulfill(self, **kwargs) -> None:
+        self.calls.append(("fulfill", kwargs))
+
+    async def continue_(self) -> None:
+        self.calls.append(("continue", {}))
+
+
+class FakePage:
+    """Fake page recording route registrations."""
+
+    def __init__(self):
+        self.routes = []
+
+    def route(self, url_pattern, handler) -> None:
+        self.routes.append((url_pattern, handler))
+
+
+class FakeAsyncPage(FakePage):
+    """Fake async page recording route registrations."""
+
+    async def route(self, url_pattern, handler) -> None:
+        self.routes.append((url_pattern, handler))
+
+
+class TestAsyncAPIInterceptor:
+    """Tests for the async interceptor."""
+
+    def test_shares_base_with_sync_interceptor(self):
+        assert issubclass(AsyncAPIInterceptor, BaseAPIInterceptor)
+        assert not issubclass(AsyncAPIInterceptor, APIInterceptor)
+
+    def test_captures_and_fulfills_async_route(self):
+        interceptor = AsyncAPIInterceptor()
+        page = FakeAsyncPage()
+        route = FakeAsyncRoute(DISCOVER_URL.format(year=2020))
+
+        async def run():
+            await interceptor.setup_interception(page, capture_responses=True)
+            _, handler = page.routes[0]
+            await handler(route)
+
+        asyncio.run(run())
+
+        assert route.calls == [("fulfill", {
+            "status": 200,
+            "headers": FakeResponse.headers,
+            "body": RESPONSE_BODY,
+        })]
+        assert interceptor.validate_request_contains("discover", {"year": 2020})
+        assert interceptor.validate_response_status("discover", 200)
+        assert interceptor.validate_response_json_schema("discover", ["page", "results"])
+
+    def test_continues_route_without_response_capture(self):
+        interceptor = AsyncAPIInterceptor()
+        page = FakeAsyncPage()
+        route = FakeAsyncRoute(DISCOVER_URL.format(year=2020))
+
+        async def run():
+            await interceptor.setup_interception(page)
+            _, handler = page.routes[0]
+            await handler(route)
+
+        asyncio.run(run())
+
+        assert route.calls == [("continue", {})]
+        assert len(interceptor.requests) == 1
+        assert not interceptor.responses
+
+
+def route_handler(interceptor: APIInterceptor, **options):
+    """Set up interception on a fresh fake page and return its route handler."""
+    page = FakePage()
+    interceptor.setup_interception(page, **options)
+    _, handler = page.routes[0]
+    return handler
+
+
+def capture(handler, *urls: str) -> None:
+    """Feed URLs through a sync route handler."""
+    for url in urls:
+        handler(FakeRoute(url))
+
+
+class TestAPIInterceptor:
+    """Tests for the sync interceptor."""
+
+    def test_routes_each_pattern_once_per_page(self):
+        interceptor = APIInterceptor()
+        page = FakePage()
+
+        interceptor.setup_interception(page)
+        interceptor.setup_interception(page)
+        interceptor.setup_interception(page, "**/other/**")
+
+        assert [pattern for pattern, _ in page.routes] == [page.routes[0][0], "**/other/**"]
+
+    def test_capture_options_are_per_page(self):
+        interceptor = APIInterceptor()
+        capturing_handler = route_handler(interceptor, capture_responses=True)
+        plain_handler = route_handler(interceptor)
+        capturing_route = FakeRoute(DISCOVER_URL.format(year=2020))
+        plain_route = FakeRoute(DISCOVER_URL.format(year=2021))
+
+        capturing_handler(capturing_route)
+        plain_handler(plain_route)
+
+        assert capturing_route.calls[0][0] == "fulfill"
+        assert plain_route.calls == [("continue", {})]
+        assert len(interceptor.responses) == 1
+
+    def test_repeated_setup_updates_options_for_that_page(self):
+        interceptor = APIInterceptor()
+        page = FakePage()
+        interceptor.setup_interception(page)
+        interceptor.setup_interception(page, capture_responses=True)
+        _, handler = page.routes[0]
+        route = FakeRoute(DISCOVER_URL.format(year=2020))
+
+        handler(route)
+
+        assert len(page.routes) == 1
+        assert route.calls[0][0] == "fulfill"
+
+    def test_rejects_empty_history(self):
+        with pytest.raises(ValueError):
+            APIInterceptor(max_history=0)
+
+    def test_captures_and_fulfills_with_fetched_body(self):
+        interceptor = APIInterceptor()
+        route = FakeRoute(DISCOVER_URL.format(year=2020))
+
+        route_handler(interceptor, capture_responses=True)(route)
+
+        assert route.calls == [("fulfill", {
+            "status": 200,
+            "headers": FakeResponse.headers,
+            "body": RESPONSE_BODY,
+        })]
+        assert interceptor.validate_response_status("discover", 200)
+        assert interceptor.validate_response_json_schema("discover", ["page", "results"])
+        assert not interceptor.validate_response_json_schema("discover", ["genres"])
+
+    def test_token_and_substring_lookups_return_latest_match(self):
+        interceptor = APIInterceptor()
+        capture(
+            route_handler(interceptor),
+            "https://api.themoviedb.org/3/movie/top_rated?page=1",
+            "https://api.themoviedb.org/3/tv/popular?page=1",
+            "https://api.themoviedb.org/3/movie/popular?page=2",
+        )
+
+        # Whole URL token, answered from the index
+        assert interceptor.get_last_request_for("tv")["url"].endswith("/tv/popular?page=1")
+        assert interceptor.get_last_request_for("movie")["url"].endswith("/movie/popular?page=2")
+        # Partial token, answered by the substring scan
+        assert interceptor.get_last_request_for("top")["url"].endswith("/top_rated?page=1")
+        assert interceptor.get_last_request_for("opul")["url"].endswith("/movie/popular?page=2")
+        assert interceptor.get_last_request_for("trending") is None
+
+    def test_eviction_keeps_lookups_consistent(self):
+        interceptor = APIInterceptor(max_history=2)
+        handler = route_handler(interceptor)
+        capture(
+            handler,
+            "https://api.themoviedb.org/3/tv/popular?page=1",
+            "https://api.themoviedb.org/3/movie/popular?page=1",
+            "https://api.themoviedb.org/3/movie/popular?page=2",
+        )
+
+        assert len(interceptor.requests) == 2
+        assert interceptor.get_last_request_for("tv") is None
+        assert interceptor.get_requests("tv") == []
+        assert interceptor.get_last_request_for("movie")["url"].endswith("page=2")
+
+        capture(handler, "https://api.themoviedb.org/3/tv/popular?page=3")
+
+        assert interceptor.get_last_request_for("tv")["url"].endswith("page=3")
+        assert interceptor.get_last_request_for("page=2")["url"].endswith("/movie/popular?page=2")
+        assert interceptor.get_last_request_for("page=1") is None
+
+    def test_clear_history_resets_lookups(self):
+        interceptor = APIInterceptor()
+        handler = route_handler(interceptor, capture_responses=True)
+        capture(handler, DISCOVER_URL.format(year=2020))
+
+        interceptor.clear_history()
+
+        assert interceptor.get_last_request_for("discover") is None
+        assert interceptor.get_last_response_for("discover") is None
+        assert not interceptor.validate_request_contains("discover", {"year": 2020})
+
+        capture(handler, DISCOVER_URL.format(year=2021))
+
+        assert interceptor.get_last_request_for("discover")["url"] == DISCOVER_URL.format(year=2021)
+        assert interceptor.get_last_response_for("discover")["status"] == 200
+
+    @pytest.mark.parametrize("url, expected", [
+        ("https://api.themoviedb.org/3/discover/movie?page=1", True),
+        ("http://api.themoviedb.org/3/movie/popular", True),
+        ("https://notapi.themoviedb.org/3/discover/movie", False),
+        ("https://www.themoviedb.org/login?next=https://api.themoviedb.org/3/x", False),
+    ])
+    def test_default_pattern_matches_only_tmdb_api_host(self, url, expected):
+        page = FakePage()
+        APIInterceptor().setup_interception(page)
+        pattern, _ = page.routes[0]
+
+        assert bool(pattern.search(url)) is expected
+
+    @pytest.mark.parametrize("expected_params, passes", [
+        ({"year": 2020, "with_genres": "28,12"}, True),
+        ({"with_genres": "28%2C12"}, True),
+        ({"query": "C++"}, True),
+        ({"query": "C%2B%2B"}, True),
+        ({"year": 202}, False),
+        ({"with_genres": "28"}, False),
+    ])
+    def test_validate_request_contains_matches_exact_values(self, expected_params, passes):
+        interceptor = APIInterceptor()
+        capture(route_handler(interceptor), "https://api.themoviedb.org/3/discover/movie?year=2020&with_genres=28%2C12&query=C%2B%2B")
+
+        assert interceptor.validate_request_contains("discover", expected_params) is passes
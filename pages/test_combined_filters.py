@@ -6,6 +6,7 @@ import allure
 from playwright.sync_api import Page
 from pages.home_page import HomePage
 from .api_interceptor import APIInterceptor
+from ._allure_shim import step, attach
 
 
 @allure.epic("TMDB Discover")
@@ -36,31 +37,31 @@ class TestCombinedFilters:
             5. Verify API request contains both parameters
             6. Verify results match criteria
         """
-        with allure.step("Navigate and setup"):
+        with step("Navigate and setup"):
             home_page.navigate()
             api_interceptor.setup_interception(page)
         
-        with allure.step("Select Top Rated category"):
+        with step("Select Top Rated category"):
             home_page.select_category("top-rated")
         
-        with allure.step("Select Movies type"):
+        with step("Select Movies type"):
             home_page.select_type("movie")
         
-        with allure.step("Verify URL reflects both filters"):
+        with step("Verify URL reflects both filters"):
             current_url = page.url
-            allure.attach(current_url, "Current URL", allure.attachment_type.TEXT)
+            attach(current_url, "Current URL", allure.attachment_type.TEXT)
             # URL should indicate both category and type
         
-        with allure.step("Verify results are displayed"):
+        with step("Verify results are displayed"):
             results_count = home_page.get_results_count()
-            allure.attach(str(results_count), "Results Count", allure.attachment_type.TEXT)
+            attach(str(results_count), "Results Count", allure.attachment_type.TEXT)
             assert results_count > 0, "Should display filtered results"
         
-        with allure.step("Verify API request contains correct parameters"):
+        with step("Verify API request contains correct parameters"):
             last_request = api_interceptor.get_last_request()
             if last_request:
                 request_url = last_request["url"]
-                allure.attach(request_url, "API Request URL", allure.attachment_type.TEXT)
+                attach(request_url, "API Request URL", allure.attachment_type.TEXT)
                 assert "top_rated" in request_url or "top" in request_url
                 assert "movie" in request_url
     
@@ -70,15 +71,15 @@ class TestCombinedFilters:
     @pytest.mark.high
     def test_category_type_year_filters(self, home_page: HomePage):
         """Verify combining category, type, and year filters."""
-        with allure.step("Navigate to home page"):
+        with step("Navigate to home page"):
             home_page.navigate()
         
-        with allure.step("Apply Popular + Movies + 2020"):
+        with step("Apply Popular + Movies + 2020"):
             home_page.select_category("popular")
             home_page.select_type("movie")
             home_page.filter_by_year(2020)
         
-        with allure.step("Verify all filters persist"):
+        with step("Verify all filters persist"):
             # All filters should remain active
             assert home_page.has_results() or home_page.has_no_results_message(), \
                 "Should show results or no results message"
@@ -90,19 +91,19 @@ class TestCombinedFilters:
     @pytest.mark.regression
     def test_all_filters_combined(self, home_page: HomePage):
         """Verify combining all available filters."""
-        with allure.step("Navigate to home page"):
+        with step("Navigate to home page"):
             home_page.navigate()
         
-        with allure.step("Apply all filters"):
+        with step("Apply all filters"):
             home_page.select_category("top-rated")
             home_page.select_type("movie")
             home_page.filter_by_year(2020)
             home_page.filter_by_rating(8.0)
         
-        with allure.step("Verify system handles all filters"):
+        with step("Verify system handles all filters"):
             # System should handle multiple filters gracefully
             results_count = home_page.get_results_count()
-            allure.attach(str(results_count), "Results Count", allure.attachment_type.TEXT)
+            attach(str(results_count), "Results Count", allure.attachment_type.TEXT)
             
             # Either results or no results message should appear
             has_content = home_page.has_results() or home_page.has_no_results_message()
@@ -114,22 +115,22 @@ class TestCombinedFilters:
     @pytest.mark.medium
     def test_filters_persist_during_pagination(self, page: Page, home_page: HomePage):
         """Verify filters remain active when navigating pages."""
-        with allure.step("Navigate and apply filters"):
+        with step("Navigate and apply filters"):
             home_page.navigate()
             home_page.select_category("popular")
             home_page.select_type("movie")
         
-        with allure.step("Capture URL after filters"):
+        with step("Capture URL after filters"):
             url_before_pagination = page.url
-            allure.attach(url_before_pagination, "URL Before Pagination", allure.attachment_type.TEXT)
+            attach(url_before_pagination, "URL Before Pagination", allure.attachment_type.TEXT)
         
-        with allure.step("Navigate to next page"):
+        with step("Navigate to next page"):
             if home_page.is_next_page_available():
                 home_page.go_to_next_page()
         
-        with allure.step("Verify filters persist in URL"):
+        with step("Verify filters persist in URL"):
             url_after_pagination = page.url
-            allure.attach(url_after_pagination, "URL After Pagination", allure.attachment_type.TEXT)
+            attach(url_after_pagination, "URL After Pagination", allure.attachment_type.TEXT)
             
             # Core filter parameters should still be in URL
             assert "popular" in url_after_pagination.lower() or \